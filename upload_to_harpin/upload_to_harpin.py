@@ -24,15 +24,27 @@ if sys.version_info < (3, 7):
     sys.exit(1)
 
 import os
+import mmap
+import hashlib
+import stat
+import shutil
+import tempfile
 import time
+import random
+import threading
+import traceback
 import json
 import argparse
 from pathlib import Path
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Tuple, Callable, Iterator
+from concurrent.futures import Future
 from datetime import datetime
 
 try:
     import requests
+    import urllib3
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 except ImportError:
     print("Error: 'requests' library is required. Install with: pip3 install requests", file=sys.stderr)
     print("  (or: python3 -m pip install requests)", file=sys.stderr)
@@ -45,6 +57,26 @@ except ImportError:
     print("  (or: python3 -m pip install tqdm)", file=sys.stderr)
     sys.exit(2)
 
+# Optional: parse large list responses incrementally
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Optional: faster JSON encoding and decoding
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: faster gzip compression for --gzip
+try:
+    from isal import igzip as gzip
+    GZIP_COMPRESS_LEVEL = 2  # isal levels range from 0 to 3
+except ImportError:
+    import gzip
+    GZIP_COMPRESS_LEVEL = 6
+
 # ============================================================================
 # CONFIGURATION & CONSTANTS
 # ============================================================================
@@ -54,8 +86,28 @@ MAX_CONCURRENT_UPLOADS = 3  # Maximum number of concurrent uploads allowed
 MAX_FILE_SIZE_GB = 5  # Maximum file size in GB
 MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_GB * 1024 * 1024 * 1024
 RETRY_ATTEMPTS = 3  # Number of retry attempts for network failures
-RETRY_DELAY_SECONDS = 10  # Delay between retries
-POLL_INTERVAL_SECONDS = 5  # Polling interval for status checks
+RETRY_BACKOFF_FACTOR = 2  # Exponential backoff factor between retries, in seconds
+RETRY_STATUS_CODES = frozenset([429, 500, 502, 503, 504])  # Responses that are retried
+POLL_MIN_INTERVAL_SECONDS = 1.0  # Initial polling interval for status checks
+POLL_MAX_INTERVAL_SECONDS = 30.0  # Polling interval cap while status is unchanged
+POLL_BACKOFF_FACTOR = 1.5  # Polling interval growth per unchanged poll
+POLL_JITTER = 0.3  # Random extra delay as a fraction of the polling interval
+UPLOAD_BLOCK_SIZE = 1024 * 1024  # Bytes written to the socket per send during S3 upload
+PROGRESS_REFRESH_SECONDS = 0.2  # Interval between upload progress bar refreshes
+COMPRESS_BLOCK_SIZE = 1024 * 1024  # Bytes read per block when compressing with --gzip
+S3_CONNECT_TIMEOUT_SECONDS = 30  # Time allowed to connect to S3 before retrying
+S3_READ_TIMEOUT_SECONDS = 300  # Time allowed per socket send/receive during S3 upload
+
+FILE_SIZE_UNITS = ['B', 'KB', 'MB', 'GB', 'TB']  # Units for human-readable file sizes
+
+# Upload statuses that count towards the concurrent upload limit
+IN_PROGRESS_STATUSES = frozenset(['created', 'analysisInProgress', 'analysisCompleted', 'importRequested', 'importInProgress'])
+
+# Local records of in-flight uploads, used by --resume
+INFLIGHT_DIR = Path.home() / '.harpin' / 'inflight'
+
+# Major version of the installed urllib3 (requests accepts both 1.x and 2.x)
+URLLIB3_MAJOR_VERSION = int(urllib3.__version__.split('.')[0])
 
 # Exit codes
 EXIT_SUCCESS = 0
@@ -66,47 +118,111 @@ EXIT_SYSTEM_ERROR = 2
 # HELPER FUNCTIONS
 # ============================================================================
 
+# Messages are printed with tqdm.write so that lines logged from a background
+# thread while a progress bar is on screen do not break up the bar
+
 def log_info(message: str):
     """Print info message to stdout."""
-    print(f"ℹ {message}")
+    tqdm.write(f"ℹ {message}")
 
 def log_success(message: str):
     """Print success message to stdout."""
-    print(f"✓ {message}")
+    tqdm.write(f"✓ {message}")
 
 def log_error(message: str):
     """Print error message to stderr."""
-    print(f"✗ {message}", file=sys.stderr)
+    tqdm.write(f"✗ {message}", file=sys.stderr)
 
 def log_progress(message: str):
     """Print progress message to stdout."""
-    print(f"⏳ {message}")
+    tqdm.write(f"⏳ {message}")
 
 def format_file_size(size_bytes: int) -> str:
     """Format file size in human-readable format."""
-    for unit in ['B', 'KB', 'MB', 'GB']:
-        if size_bytes < 1024.0:
-            return f"{size_bytes:.2f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.2f} TB"
-
-def retry_on_network_error(func):
-    """Decorator to retry function on network errors."""
-    def wrapper(*args, **kwargs):
-        last_exception = None
-        for attempt in range(1, RETRY_ATTEMPTS + 1):
-            try:
-                return func(*args, **kwargs)
-            except requests.exceptions.RequestException as e:
-                last_exception = e
-                if attempt < RETRY_ATTEMPTS:
-                    log_progress(f"Network error (attempt {attempt}/{RETRY_ATTEMPTS}): {str(e)}")
-                    log_progress(f"Retrying in {RETRY_DELAY_SECONDS} seconds...")
-                    time.sleep(RETRY_DELAY_SECONDS)
-                else:
-                    log_error(f"Network error after {RETRY_ATTEMPTS} attempts: {str(e)}")
-        raise last_exception
-    return wrapper
+    # Units are powers of 1024, so the unit index is the bit length / 10
+    unit = min(max(size_bytes.bit_length() - 1, 0) // 10, len(FILE_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (10 * unit)):.2f} {FILE_SIZE_UNITS[unit]}"
+
+def dump_json(data: Any) -> bytes:
+    """Encode data as a JSON request body, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode('utf-8')
+
+def parse_json(response: requests.Response) -> Any:
+    """
+    Decode a JSON response body, using orjson when available.
+    Raises requests.exceptions.JSONDecodeError (a ValueError and a
+    RequestException) if the body is not valid JSON, like response.json().
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError as e:
+            raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos) from e
+    return response.json()
+
+def log_error_details(response: requests.Response):
+    """Print the body of a failed API response, pretty-printed if it is JSON."""
+    try:
+        error_data = parse_json(response)
+    except ValueError:
+        log_error(f"Response: {response.text}")
+    else:
+        log_error(f"Error details: {json.dumps(error_data, indent=2)}")
+
+class UploadAdapter(HTTPAdapter):
+    """
+    HTTP adapter that sends request bodies in large blocks.
+    urllib3 otherwise reads and sends the body 16 KiB at a time, which caps
+    single-stream upload throughput on fast links. The blocksize pool option
+    only exists in urllib3 2.x; on 1.x this behaves like the default adapter.
+    """
+    def init_poolmanager(self, *args, **kwargs):
+        if URLLIB3_MAJOR_VERSION >= 2:
+            kwargs['blocksize'] = UPLOAD_BLOCK_SIZE
+        super().init_poolmanager(*args, **kwargs)
+
+# Retry policy for both sessions: network errors and transient error
+# responses are retried with exponential backoff, honoring Retry-After
+RETRY_POLICY = Retry(
+    total=RETRY_ATTEMPTS,
+    backoff_factor=RETRY_BACKOFF_FACTOR,
+    status_forcelist=RETRY_STATUS_CODES,
+    allowed_methods=frozenset(['GET', 'PUT', 'POST']),
+    respect_retry_after_header=True,
+    raise_on_status=False
+)
+
+# Shared session for harpin API calls so every request reuses the same
+# keep-alive connection instead of a new TCP + TLS handshake. API calls are
+# made one at a time, so a single HTTP/1.1 connection serves the whole run
+# and HTTP/2 multiplexing would not save any further handshakes.
+SESSION = requests.Session()
+SESSION.headers["Content-Type"] = "application/json"
+SESSION.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=RETRY_POLICY))
+
+# Dedicated session for S3 so the connection to the bucket is kept alive
+# across retry attempts
+S3_SESSION = requests.Session()
+S3_SESSION.mount('https://', UploadAdapter(pool_connections=1, pool_maxsize=1, max_retries=RETRY_POLICY))
+
+def run_in_background(func: Callable[..., Any], *args) -> Future:
+    """
+    Run a function in a daemon thread and return a Future for its result.
+    Unlike executor workers, the thread does not hold up interpreter exit if
+    the main thread exits first.
+    """
+    future = Future()
+    
+    def runner():
+        try:
+            future.set_result(func(*args))
+        except BaseException as e:
+            future.set_exception(e)
+    
+    threading.Thread(target=runner, daemon=True).start()
+    return future
 
 # ============================================================================
 # AUTHENTICATION
@@ -142,18 +258,17 @@ def get_access_token() -> str:
     log_progress("Authenticating with harpin AI...")
 
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{API_BASE_URL}/token",
-            json={
+            data=dump_json({
                 "clientId": client_id,
                 "refreshToken": refresh_token
-            },
-            headers={"Content-Type": "application/json"},
+            }),
             timeout=30
         )
         
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json(response)
             access_token = data.get('accessToken')
             if access_token:
                 log_success("Authentication successful")
@@ -163,11 +278,7 @@ def get_access_token() -> str:
                 sys.exit(EXIT_USER_ERROR)
         else:
             log_error(f"Authentication failed with status {response.status_code}")
-            try:
-                error_data = response.json()
-                log_error(f"Error details: {json.dumps(error_data, indent=2)}")
-            except:
-                log_error(f"Response: {response.text}")
+            log_error_details(response)
             sys.exit(EXIT_USER_ERROR)
             
     except requests.exceptions.RequestException as e:
@@ -178,7 +289,7 @@ def get_access_token() -> str:
 # VALIDATION FUNCTIONS
 # ============================================================================
 
-def validate_file(file_path: str) -> Tuple[Path, int]:
+def validate_file(file_path: str) -> Tuple[Path, os.stat_result]:
     """
     Validate that file exists, is readable, and within size limits.
     
@@ -186,7 +297,7 @@ def validate_file(file_path: str) -> Tuple[Path, int]:
         file_path: Path to the CSV file
         
     Returns:
-        Tuple of (Path object, file size in bytes)
+        Tuple of (Path object, stat result of the file)
         
     Exits with code 1 if validation fails.
     """
@@ -194,13 +305,15 @@ def validate_file(file_path: str) -> Tuple[Path, int]:
     
     path = Path(file_path)
     
-    # Check if file exists
-    if not path.exists():
+    # Check if file exists (a single stat serves the type and size checks too)
+    try:
+        file_stat = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
         log_error(f"File not found: {file_path}")
         sys.exit(EXIT_USER_ERROR)
     
     # Check if it's a file (not a directory)
-    if not path.is_file():
+    if not stat.S_ISREG(file_stat.st_mode):
         log_error(f"Path is not a file: {file_path}")
         sys.exit(EXIT_USER_ERROR)
     
@@ -210,44 +323,42 @@ def validate_file(file_path: str) -> Tuple[Path, int]:
         sys.exit(EXIT_USER_ERROR)
     
     # Check file size
-    file_size = path.stat().st_size
+    file_size = file_stat.st_size
     if file_size > MAX_FILE_SIZE_BYTES:
         log_error(f"File size ({format_file_size(file_size)}) exceeds maximum allowed size ({MAX_FILE_SIZE_GB} GB)")
         sys.exit(EXIT_USER_ERROR)
     
     log_success(f"File validated: {path.name} ({format_file_size(file_size)})")
-    return path, file_size
+    return path, file_stat
 
-def validate_source(source_id: str, access_token: str) -> bool:
+def validate_source(source_id: str, quiet: bool = False) -> bool:
     """
     Validate that source ID exists.
+    Called once the API has rejected a request for the source, to explain
+    the failure.
     
     Args:
         source_id: The source ID to validate
-        access_token: Bearer token for authentication
+        quiet: Only log if the source is invalid, so the caller can report
+            its own failure when the source turns out to be fine
         
     Returns:
         True if source exists
         
     Exits with code 1 if source is invalid (after showing available sources).
     """
-    log_progress(f"Validating source ID: {source_id}...")
-    
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json"
-    }
+    if not quiet:
+        log_progress(f"Validating source ID: {source_id}...")
     
     try:
         # Try to get the specific source
-        response = requests.get(
+        response = SESSION.get(
             f"{API_BASE_URL}/sources/{source_id}",
-            headers=headers,
             timeout=30
         )
         
         if response.status_code == 200:
-            source_data = response.json()
+            source_data = parse_json(response)
             source_system = source_data.get('sourceSystem', 'unknown')
             
             # Check if sourceSystem is flatFile
@@ -255,7 +366,8 @@ def validate_source(source_id: str, access_token: str) -> bool:
                 log_error(f"Invalid source type: sourceSystem is of type '{source_system}', must be of type 'flatFile'")
                 sys.exit(EXIT_USER_ERROR)
             
-            log_success(f"Source ID validated: {source_id}")
+            if not quiet:
+                log_success(f"Source ID validated: {source_id}")
             return True
         elif response.status_code == 404:
             log_error(f"Invalid source ID: {source_id}")
@@ -263,14 +375,13 @@ def validate_source(source_id: str, access_token: str) -> bool:
             
             # Get list of available sources
             try:
-                sources_response = requests.get(
+                sources_response = SESSION.get(
                     f"{API_BASE_URL}/sources",
-                    headers=headers,
                     timeout=30
                 )
                 
                 if sources_response.status_code == 200:
-                    sources_data = sources_response.json()
+                    sources_data = parse_json(sources_response)
                     sources = sources_data.get('content', [])
                     
                     # Filter to only show flatFile sources
@@ -298,66 +409,107 @@ def validate_source(source_id: str, access_token: str) -> bool:
         log_error(f"Failed to validate source ID: {str(e)}")
         sys.exit(EXIT_USER_ERROR)
 
-def check_concurrent_uploads(source_id: str, access_token: str):
+def _json_type_name(event: str, value: Any) -> str:
+    """Python type name of a JSON value from its ijson event."""
+    return {'start_map': 'dict', 'start_array': 'list'}.get(event, type(value).__name__)
+
+def iter_upload_statuses(response: requests.Response) -> Iterator[Any]:
+    """
+    Yield the status of each upload in an uploads listing response.
+    
+    When ijson is installed the body is parsed incrementally, so only the
+    status values are materialized rather than the whole listing.
+    
+    Args:
+        response: Streamed response from the uploads API
+        
+    Exits with code 2 if the response is neither a list nor a dict, or,
+    when parsed incrementally, is not valid JSON or the connection fails.
+    """
+    if ijson is None:
+        uploads = parse_json(response)
+        
+        # Handle paginated/wrapped response (dict with 'content' field) or direct list
+        if isinstance(uploads, dict):
+            uploads = uploads.get('content', [])
+        elif not isinstance(uploads, list):
+            log_error(f"Unexpected response format from uploads API: expected list or dict, got {type(uploads).__name__}")
+            sys.exit(EXIT_SYSTEM_ERROR)
+        
+        for u in uploads:
+            # Skip non-dictionary items with a warning
+            if not isinstance(u, dict):
+                log_info(f"Warning: Skipping non-dictionary upload item: {type(u).__name__}")
+                continue
+            yield u.get('status')
+        return
+    
+    response.raw.decode_content = True
+    events = ijson.parse(response.raw)
+    
+    try:
+        # Handle paginated/wrapped response (dict with 'content' field) or direct list
+        _, event, value = next(events, ('', None, None))
+        if event == 'start_map':
+            item_prefix = 'content.item'
+        elif event == 'start_array':
+            item_prefix = 'item'
+        else:
+            log_error(f"Unexpected response format from uploads API: expected list or dict, got {_json_type_name(event, value)}")
+            sys.exit(EXIT_SYSTEM_ERROR)
+        status_prefix = f"{item_prefix}.status"
+        
+        for prefix, event, value in events:
+            if prefix == status_prefix and event == 'string':
+                yield value
+            elif prefix == item_prefix and event not in ('start_map', 'map_key', 'end_map', 'end_array'):
+                # Skip non-dictionary items with a warning
+                log_info(f"Warning: Skipping non-dictionary upload item: {_json_type_name(event, value)}")
+    except ijson.JSONError as e:
+        # The yajl backends append a multi-line excerpt; keep the first line
+        detail = str(e).strip().split('\n', 1)[0]
+        log_error(f"Failed to check concurrent uploads: invalid JSON in uploads API response ({detail})")
+        sys.exit(EXIT_SYSTEM_ERROR)
+    except urllib3.exceptions.HTTPError as e:
+        # Reading response.raw directly bypasses requests' exception wrapping
+        log_error(f"Failed to check concurrent uploads: {str(e)}")
+        sys.exit(EXIT_SYSTEM_ERROR)
+
+def check_concurrent_uploads(source_id: str):
     """
     Check if concurrent upload limit has been reached.
     
     Args:
         source_id: The source ID
-        access_token: Bearer token for authentication
         
     Exits with code 1 if limit is reached.
     """
     log_progress("Checking concurrent uploads...")
     
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json"
-    }
-    
     try:
-        response = requests.get(
+        with SESSION.get(
             f"{API_BASE_URL}/sources/{source_id}/uploads",
-            headers=headers,
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            uploads = response.json()
-            
-            # Handle paginated/wrapped response (dict with 'content' field) or direct list
-            if isinstance(uploads, dict):
-                uploads = uploads.get('content', [])
-            elif not isinstance(uploads, list):
-                log_error(f"Unexpected response format from uploads API: expected list or dict, got {type(uploads).__name__}")
-                sys.exit(EXIT_SYSTEM_ERROR)
-            
-            # Count in-progress uploads
-            in_progress_statuses = ['created', 'analysisInProgress', 'analysisCompleted', 'importRequested', 'importInProgress']
-            in_progress = []
-            
-            for u in uploads:
-                # Skip non-dictionary items with a warning
-                if not isinstance(u, dict):
-                    log_info(f"Warning: Skipping non-dictionary upload item: {type(u).__name__}")
-                    continue
+            timeout=30,
+            stream=True
+        ) as response:
+            if response.status_code == 200:
+                # Count in-progress uploads
+                in_progress_count = sum(1 for status in iter_upload_statuses(response)
+                                        if status in IN_PROGRESS_STATUSES)
                 
-                status = u.get('status')
-                if status in in_progress_statuses:
-                    in_progress.append(u)
-            
-            in_progress_count = len(in_progress)
-            
-            if in_progress_count >= MAX_CONCURRENT_UPLOADS:
-                log_error(f"Maximum concurrent uploads ({MAX_CONCURRENT_UPLOADS}) reached")
-                log_error(f"Currently {in_progress_count} upload(s) in progress")
-                log_info("Please wait for existing uploads to complete before starting a new one")
-                sys.exit(EXIT_USER_ERROR)
-            
-            log_success(f"Concurrent uploads check passed ({in_progress_count}/{MAX_CONCURRENT_UPLOADS})")
-        else:
-            log_error(f"Failed to check concurrent uploads (status {response.status_code})")
-            sys.exit(EXIT_SYSTEM_ERROR)
+                if in_progress_count >= MAX_CONCURRENT_UPLOADS:
+                    log_error(f"Maximum concurrent uploads ({MAX_CONCURRENT_UPLOADS}) reached")
+                    log_error(f"Currently {in_progress_count} upload(s) in progress")
+                    log_info("Please wait for existing uploads to complete before starting a new one")
+                    sys.exit(EXIT_USER_ERROR)
+                
+                log_success(f"Concurrent uploads check passed ({in_progress_count}/{MAX_CONCURRENT_UPLOADS})")
+            else:
+                # Explain an invalid source ID (exits if the source is invalid)
+                if response.status_code == 404:
+                    validate_source(source_id, quiet=True)
+                log_error(f"Failed to check concurrent uploads (status {response.status_code})")
+                sys.exit(EXIT_SYSTEM_ERROR)
             
     except requests.exceptions.RequestException as e:
         log_error(f"Failed to check concurrent uploads: {str(e)}")
@@ -367,35 +519,55 @@ def check_concurrent_uploads(source_id: str, access_token: str):
 # UPLOAD WORKFLOW
 # ============================================================================
 
-@retry_on_network_error
-def create_upload(source_id: str, file_name: str, access_token: str) -> Tuple[str, str]:
+def compress_file(file_path: Path, file_size: int) -> Tuple[Path, int]:
+    """
+    Gzip-compress the file into a new temporary directory.
+    
+    Args:
+        file_path: Path to the CSV file
+        file_size: Size of the file in bytes
+        
+    Returns:
+        Tuple of (path to <fileName>.gz, compressed size in bytes)
+    """
+    log_progress(f"Compressing {file_path.name}...")
+    
+    compressed_path = Path(tempfile.mkdtemp(prefix='harpin-')) / f"{file_path.name}.gz"
+    try:
+        with open(file_path, 'rb') as src, gzip.open(compressed_path, 'wb', compresslevel=GZIP_COMPRESS_LEVEL) as dst:
+            with tqdm(total=file_size, unit='B', unit_scale=True, desc=file_path.name) as pbar:
+                for block in iter(lambda: src.read(COMPRESS_BLOCK_SIZE), b''):
+                    dst.write(block)
+                    pbar.update(len(block))
+    except BaseException:
+        shutil.rmtree(compressed_path.parent, ignore_errors=True)
+        raise
+    
+    compressed_size = compressed_path.stat().st_size
+    log_success(f"File compressed: {compressed_path.name} ({format_file_size(compressed_size)})")
+    return compressed_path, compressed_size
+
+def create_upload(source_id: str, file_name: str) -> Tuple[str, str]:
     """
     Create an upload and get presigned URL.
     
     Args:
         source_id: The source ID
         file_name: Name of the file to upload
-        access_token: Bearer token for authentication
         
     Returns:
         Tuple of (upload_id, presigned_url)
     """
     log_progress("Creating upload...")
     
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json"
-    }
-    
-    response = requests.post(
+    response = SESSION.post(
         f"{API_BASE_URL}/sources/{source_id}/uploads",
-        json={"fileName": file_name},
-        headers=headers,
+        data=dump_json({"fileName": file_name}),
         timeout=30
     )
     
     if response.status_code in [200, 201]:
-        data = response.json()
+        data = parse_json(response)
         upload_id = data.get('id')
         presigned_url = data.get('url')
         
@@ -406,38 +578,77 @@ def create_upload(source_id: str, file_name: str, access_token: str) -> Tuple[st
         log_success(f"Upload created: {upload_id}")
         return upload_id, presigned_url
     else:
+        # Explain an invalid source ID (exits if the source is invalid)
+        if response.status_code in (400, 404):
+            validate_source(source_id, quiet=True)
         log_error(f"Failed to create upload (status {response.status_code})")
-        try:
-            error_data = response.json()
-            log_error(f"Error details: {json.dumps(error_data, indent=2)}")
-        except:
-            log_error(f"Response: {response.text}")
+        log_error_details(response)
         sys.exit(EXIT_SYSTEM_ERROR)
 
-class ProgressFileWrapper:
+class MappedFileReader:
     """
-    File-like wrapper that updates a progress bar as data is read.
-    This avoids chunked transfer encoding while maintaining streaming capability.
+    File-like reader over a memory-mapped file.
+    Hands out memoryview slices of the mapping instead of copying the data,
+    and only counts bytes read so progress can be sampled from another thread
+    rather than updated on every read.
+    Calls on_complete once the whole file has been consumed.
     """
-    def __init__(self, file_obj, progress_bar):
-        self.file_obj = file_obj
-        self.progress_bar = progress_bar
+    def __init__(self, file_obj, size: int, on_complete: Optional[Callable[[], None]] = None):
+        self.size = size
+        self.position = 0
+        self.on_complete = on_complete
+        # mmap cannot map an empty file
+        self._mmap = mmap.mmap(file_obj.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        # Let the kernel read ahead aggressively and reclaim pages once sent
+        # (madvise is only available on Python 3.8+ and Unix)
+        if self._mmap and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            self._mmap.madvise(mmap.MADV_SEQUENTIAL)
+        self._view = memoryview(self._mmap) if self._mmap else memoryview(b'')
     
     def read(self, size=-1):
-        """Read data and update progress bar."""
-        data = self.file_obj.read(size)
-        if data:
-            self.progress_bar.update(len(data))
-        return data
+        """Return the next slice of the file and advance the position."""
+        start = self.position
+        if start >= self.size and self.on_complete:
+            # The end-of-body read happens after the last chunk was sent
+            on_complete, self.on_complete = self.on_complete, None
+            on_complete()
+        end = self.size if size is None or size < 0 else min(start + size, self.size)
+        self.position = end
+        return self._view[start:end]
+    
+    def tell(self) -> int:
+        """Return the current position."""
+        return self.position
+    
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        """Move the position, letting urllib3 rewind the body to retry a request."""
+        base = {os.SEEK_SET: 0, os.SEEK_CUR: self.position, os.SEEK_END: self.size}[whence]
+        self.position = max(0, base + offset)
+        return self.position
+    
+    def close(self):
+        """Release the mapping."""
+        self._view.release()
+        if self._mmap:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # A slice is still referenced elsewhere; the mapping is freed with it
+                pass
     
     def __enter__(self):
         return self
     
     def __exit__(self, *args):
-        pass
+        self.close()
 
-@retry_on_network_error
-def upload_to_s3(presigned_url: str, file_path: Path, file_size: int):
+def track_progress(sync_progress: Callable[[], None], done: threading.Event):
+    """Refresh the progress bar periodically until done is set."""
+    while not done.wait(PROGRESS_REFRESH_SECONDS):
+        sync_progress()
+
+def upload_to_s3(presigned_url: str, file_path: Path, file_size: int,
+                 on_sent: Optional[Callable[[], None]] = None):
     """
     Upload file to S3 using presigned URL with progress indicator.
     
@@ -445,23 +656,43 @@ def upload_to_s3(presigned_url: str, file_path: Path, file_size: int):
         presigned_url: The presigned S3 URL
         file_path: Path to the file to upload
         file_size: Size of the file in bytes
+        on_sent: Called once the whole file has been sent, before S3 responds
     """
     log_progress(f"Uploading {file_path.name} to S3...")
     
-    # Use tqdm for progress bar with custom file wrapper
-    with open(file_path, 'rb') as f:
+    # Stream the mapped file; a background thread keeps the tqdm bar current
+    with open(file_path, 'rb') as f, MappedFileReader(f, file_size) as reader:
         with tqdm(total=file_size, unit='B', unit_scale=True, desc=file_path.name) as pbar:
-            wrapped_file = ProgressFileWrapper(f, pbar)
+            progress_lock = threading.Lock()
+            
+            def sync_progress():
+                with progress_lock:
+                    pbar.update(reader.position - pbar.n)
             
-            response = requests.put(
-                presigned_url,
-                data=wrapped_file,
-                headers={
-                    "Content-Type": "text/csv",
-                    "Content-Length": str(file_size)
-                },
-                timeout=300
-            )
+            def sent():
+                # Show the finished bar before anything started by on_sent logs
+                sync_progress()
+                if on_sent:
+                    on_sent()
+            
+            reader.on_complete = sent
+            done = threading.Event()
+            ticker = threading.Thread(target=track_progress, args=(sync_progress, done), daemon=True)
+            ticker.start()
+            try:
+                response = S3_SESSION.put(
+                    presigned_url,
+                    data=reader,
+                    headers={
+                        "Content-Type": "text/csv",
+                        "Content-Length": str(file_size)
+                    },
+                    timeout=(S3_CONNECT_TIMEOUT_SECONDS, S3_READ_TIMEOUT_SECONDS)
+                )
+            finally:
+                done.set()
+                ticker.join()
+            sync_progress()
     
     if response.status_code == 200:
         log_success("File uploaded to S3 successfully")
@@ -470,15 +701,17 @@ def upload_to_s3(presigned_url: str, file_path: Path, file_size: int):
         log_error(f"Response: {response.text}")
         sys.exit(EXIT_SYSTEM_ERROR)
 
-@retry_on_network_error
-def poll_status(source_id: str, upload_id: str, access_token: str, target_status: str, phase_name: str) -> Dict[str, Any]:
+def poll_status(source_id: str, upload_id: str, target_status: str, phase_name: str) -> Dict[str, Any]:
     """
     Poll upload status until target status is reached.
     
+    The harpin API has no long-poll, server-sent events or webhook channel
+    for upload status, so this short-polls with exponential backoff and
+    conditional requests to keep the number of round trips low.
+    
     Args:
         source_id: The source ID
         upload_id: The upload ID
-        access_token: Bearer token for authentication
         target_status: The status to wait for
         phase_name: Name of the phase for logging
         
@@ -487,29 +720,30 @@ def poll_status(source_id: str, upload_id: str, access_token: str, target_status
     """
     log_progress(f"Waiting for {phase_name}...")
     
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json"
-    }
-    
     start_time = time.time()
     last_status = None
+    etag = None
+    delay = POLL_MIN_INTERVAL_SECONDS
     
     while True:
-        response = requests.get(
+        # Let the API answer 304 with no body when nothing has changed
+        request_headers = {"If-None-Match": etag} if etag else None
+        response = SESSION.get(
             f"{API_BASE_URL}/sources/{source_id}/uploads/{upload_id}",
-            headers=headers,
+            headers=request_headers,
             timeout=30
         )
         
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json(response)
+            etag = response.headers.get('ETag')
             current_status = data.get('status')
             
-            # Log status changes
+            # Log status changes and go back to polling quickly
             if current_status != last_status:
                 log_info(f"Status: {current_status}")
                 last_status = current_status
+                delay = POLL_MIN_INTERVAL_SECONDS
             
             # Check for failure
             if current_status == 'failed':
@@ -522,34 +756,27 @@ def poll_status(source_id: str, upload_id: str, access_token: str, target_status
                 elapsed = time.time() - start_time
                 log_success(f"{phase_name} completed in {elapsed:.1f} seconds")
                 return data
-            
-            # Wait before next poll
-            time.sleep(POLL_INTERVAL_SECONDS)
-        else:
+        elif response.status_code != 304:
             log_error(f"Failed to poll status (status {response.status_code})")
             sys.exit(EXIT_SYSTEM_ERROR)
+        
+        # Wait before next poll, backing off while the status is unchanged
+        time.sleep(delay + random.uniform(0, POLL_JITTER * delay))
+        delay = min(POLL_MAX_INTERVAL_SECONDS, delay * POLL_BACKOFF_FACTOR)
 
-@retry_on_network_error
-def request_import(source_id: str, upload_id: str, access_token: str):
+def request_import(source_id: str, upload_id: str):
     """
     Request import after analysis is complete.
     
     Args:
         source_id: The source ID
         upload_id: The upload ID
-        access_token: Bearer token for authentication
     """
     log_progress("Requesting import...")
     
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Content-Type": "application/json"
-    }
-    
-    response = requests.put(
+    response = SESSION.put(
         f"{API_BASE_URL}/sources/{source_id}/uploads/{upload_id}/status",
-        json={"status": "importRequested"},
-        headers=headers,
+        data=dump_json({"status": "importRequested"}),
         timeout=30
     )
     
@@ -557,13 +784,79 @@ def request_import(source_id: str, upload_id: str, access_token: str):
         log_success("Import requested")
     else:
         log_error(f"Failed to request import (status {response.status_code})")
-        try:
-            error_data = response.json()
-            log_error(f"Error details: {json.dumps(error_data, indent=2)}")
-        except:
-            log_error(f"Response: {response.text}")
+        log_error_details(response)
         sys.exit(EXIT_SYSTEM_ERROR)
 
+# ============================================================================
+# RESUME SUPPORT
+# ============================================================================
+
+def inflight_record_path(source_id: str, file_path: Path) -> Path:
+    """Path of the local in-flight upload record for a source and file."""
+    key = hashlib.sha1(f"{source_id}:{os.path.abspath(file_path)}".encode('utf-8')).hexdigest()
+    return INFLIGHT_DIR / f"{key}.json"
+
+def save_inflight_upload(record_path: Path, record: Dict[str, Any]):
+    """
+    Write the in-flight upload record so an interrupted run can be resumed.
+    Failing to write it only disables resuming, so errors are logged and ignored.
+    """
+    try:
+        record_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = record_path.with_suffix('.tmp')
+        temp_path.write_bytes(dump_json(record))
+        os.replace(temp_path, record_path)
+    except OSError as e:
+        log_info(f"Warning: Could not save upload state for --resume: {str(e)}")
+
+def clear_inflight_upload(record_path: Path):
+    """Remove the in-flight upload record once the upload has finished."""
+    try:
+        record_path.unlink()
+    except OSError:
+        pass
+
+def find_resumable_upload(source_id: str, file_stat: os.stat_result, record_path: Path) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Find an interrupted upload of this file whose data already reached S3.
+    
+    Args:
+        source_id: The source ID
+        file_stat: Stat result of the CSV file
+        record_path: Path of the in-flight upload record
+        
+    Returns:
+        Tuple of (upload_id, current status), or (None, None) if there is
+        nothing to resume and a new upload should be started
+    """
+    log_progress("Checking for an interrupted upload to resume...")
+    
+    try:
+        record = json.loads(record_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        record = None
+    
+    # Only resume if the file is unchanged since it was uploaded
+    if (not record or not record.get('uploaded')
+            or record.get('fileSize') != file_stat.st_size
+            or record.get('fileMtimeNs') != file_stat.st_mtime_ns):
+        log_info("No resumable upload found, starting a new upload")
+        return None, None
+    
+    upload_id = record['uploadId']
+    response = SESSION.get(
+        f"{API_BASE_URL}/sources/{source_id}/uploads/{upload_id}",
+        timeout=30
+    )
+    status = parse_json(response).get('status') if response.status_code == 200 else None
+    
+    if status not in IN_PROGRESS_STATUSES and status != 'importCompleted':
+        log_info(f"Upload {upload_id} cannot be resumed (status {status}), starting a new upload")
+        return None, None
+    
+    log_success(f"Resuming upload {upload_id} (status: {status})")
+    return upload_id, status
+
 # ============================================================================
 # MAIN FUNCTION
 # ============================================================================
@@ -590,10 +883,18 @@ Exit Codes:
 
 Example:
   python3 upload_to_harpin.py vMiY4q data_2026_01_06.csv
+  python3 upload_to_harpin.py --gzip vMiY4q data_2026_01_06.csv
         """
     )
     parser.add_argument('sourceId', help='Source ID for the upload')
     parser.add_argument('fileName', help='Path to the CSV file to upload')
+    parser.add_argument('--gzip', action='store_true',
+                        help='Gzip the file before upload and upload it as <fileName>.gz')
+    parser.add_argument('--resume', action='store_true',
+                        help='Record upload progress under ~/.harpin/inflight/, and resume an interrupted '
+                             '--resume run for the same file instead of uploading it again')
+    parser.add_argument('--debug', action='store_true',
+                        help='Print the full traceback on unexpected errors')
     
     args = parser.parse_args()
     
@@ -607,33 +908,74 @@ Example:
     print("harpin AI CSV Upload Script")
     print("=" * 60)
     
+    compressed_path = None
+    
     try:
         # Step 1: Authenticate
         access_token = get_access_token()
+        SESSION.headers["Authorization"] = f"Bearer {access_token}"
         
         # Step 2: Validate file
-        file_path, file_size = validate_file(file_path_str)
+        file_path, file_stat = validate_file(file_path_str)
+        file_size = file_stat.st_size
         
-        # Step 3: Validate source
-        validate_source(source_id, access_token)
+        # With --resume, record progress locally and pick up an interrupted
+        # upload of the same file
+        upload_id, status = None, None
+        record_path = inflight_record_path(source_id, file_path) if args.resume else None
+        if record_path:
+            upload_id, status = find_resumable_upload(source_id, file_stat, record_path)
         
-        # Step 4: Check concurrent uploads
-        check_concurrent_uploads(source_id, access_token)
-        
-        # Step 5: Create upload
-        upload_id, presigned_url = create_upload(source_id, file_path.name, access_token)
-        
-        # Step 6: Upload to S3
-        upload_to_s3(presigned_url, file_path, file_size)
-        
-        # Step 7: Poll for analysis completion
-        analysis_data = poll_status(source_id, upload_id, access_token, 'analysisCompleted', 'analysis')
+        if upload_id is None:
+            record = {
+                "fileSize": file_size,
+                "fileMtimeNs": file_stat.st_mtime_ns,
+                "uploaded": False
+            }
+            
+            # Step 3: Check concurrent uploads. The source ID is only validated
+            # if the API rejects it, saving a request on every successful run
+            check_concurrent_uploads(source_id)
+            
+            # Optionally compress the file to cut upload time. Done only after
+            # the cheap checks so a rejected run does not pay for compression
+            if args.gzip:
+                file_path, file_size = compress_file(file_path, file_size)
+                compressed_path = file_path
+            
+            # Step 4: Create upload
+            upload_id, presigned_url = create_upload(source_id, file_path.name)
+            record["uploadId"] = upload_id
+            if record_path:
+                save_inflight_upload(record_path, record)
+            
+            # Step 5: Upload to S3, and
+            # Step 6: Poll for analysis completion. Polling starts as soon as the
+            # last byte is sent so it overlaps with waiting for S3's response
+            analysis_polls = []
+            
+            def start_analysis_poll():
+                if not analysis_polls:
+                    analysis_polls.append(run_in_background(
+                        poll_status, source_id, upload_id, 'analysisCompleted', 'analysis'))
+            
+            upload_to_s3(presigned_url, file_path, file_size, on_sent=start_analysis_poll)
+            record["uploaded"] = True
+            if record_path:
+                save_inflight_upload(record_path, record)
+            start_analysis_poll()
+            analysis_data = analysis_polls[0].result()
+        elif status in ('created', 'analysisInProgress'):
+            analysis_data = poll_status(source_id, upload_id, 'analysisCompleted', 'analysis')
         
-        # Step 8: Request import
-        request_import(source_id, upload_id, access_token)
+        # Step 7: Request import
+        if status in (None, 'created', 'analysisInProgress', 'analysisCompleted'):
+            request_import(source_id, upload_id)
         
-        # Step 9: Poll for import completion
-        final_data = poll_status(source_id, upload_id, access_token, 'importCompleted', 'import')
+        # Step 8: Poll for import completion
+        final_data = poll_status(source_id, upload_id, 'importCompleted', 'import')
+        if record_path:
+            clear_inflight_upload(record_path)
         
         # Display final summary
         total_records = final_data.get('totalRecords', 0)
@@ -654,11 +996,19 @@ Example:
     except KeyboardInterrupt:
         log_error("\nUpload interrupted by user")
         sys.exit(EXIT_SYSTEM_ERROR)
+    except requests.exceptions.RequestException as e:
+        log_error(f"Network error after {RETRY_ATTEMPTS} retries: {str(e)}")
+        sys.exit(EXIT_SYSTEM_ERROR)
     except Exception as e:
         log_error(f"Unexpected error: {str(e)}")
-        import traceback
-        traceback.print_exc(file=sys.stderr)
+        if args.debug:
+            traceback.print_exc(file=sys.stderr)
+        else:
+            log_info("Run with --debug for the full traceback")
         sys.exit(EXIT_SYSTEM_ERROR)
+    finally:
+        if compressed_path:
+            shutil.rmtree(compressed_path.parent, ignore_errors=True)
 
 # ============================================================================
 # ENTRY POINT